@@ -8,19 +8,75 @@
 import sys
 import os
 import json
+import hashlib
+import mmap
+import multiprocessing
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json module
+    orjson = None
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QCheckBox, QPushButton, QLabel,
                              QSpinBox, QFileDialog, QScrollArea, QGroupBox,
                              QMessageBox, QTextBrowser, QComboBox, QTabWidget,
                              QSplitter, QTreeWidget, QTreeWidgetItem, QTableWidget,
                              QTableWidgetItem, QHeaderView, QLineEdit, QDialog,
-                             QFormLayout)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QUrl
-from PyQt5.QtGui import QColor, QFont, QDesktopServices, QIcon
+                             QFormLayout, QTableView, QStyledItemDelegate,
+                             QAbstractItemView, QListView)
+from PyQt5.QtCore import (Qt, QThread, QObject, pyqtSignal, pyqtSlot, QUrl,
+                          QAbstractTableModel, QAbstractListModel, QModelIndex,
+                          QEvent, QSize, QTimer, QRunnable, QThreadPool)
+from PyQt5.QtGui import (QColor, QFont, QDesktopServices, QIcon, QPen, QTextCursor,
+                         QTextCharFormat)
 
 # Assuming the helper module is named robot_core.py
 from robot_core import parse_robot_file, run_tests_api, get_environment_info
 
+# Colors and text formats reused on every log event
+_C_YELLOW = QColor("yellow")
+_C_PASS = QColor("#ccffcc")
+_C_FAIL = QColor("#ffcccc")
+_C_BLACK = QColor("black")
+_C_ORANGE = QColor("orange")
+_C_RED = QColor("red")
+
+
+def _char_format(color):
+    fmt = QTextCharFormat()
+    fmt.setForeground(color)
+    return fmt
+
+
+_FMT_DEFAULT = _char_format(_C_BLACK)
+_FMT_BY_LEVEL = {
+    "[WARN]": _char_format(_C_ORANGE),
+    "[FAIL]": _char_format(_C_RED),
+}
+_FMT_ERROR = _char_format(_C_RED)
+
+
+def _dumps_json(obj, indent=False):
+    # Serialize to UTF-8 bytes, preferring orjson when it is installed
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def _digest(data):
+    # Short fingerprint of file contents, used to detect no-op saves
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _load_json_file(path):
+    # Parse a JSON file and return (object, digest of its bytes)
+    with open(path, "rb") as f:
+        if orjson is None:
+            data = f.read()
+            return json.loads(data), _digest(data)
+        # Let orjson parse straight from the mapped file without an intermediate copy
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view), _digest(view)
+
 
 # === Class for adding a new variable dialog ===
 class AddVariableDialog(QDialog):
@@ -83,32 +139,284 @@ class AddVariableDialog(QDialog):
         }
 
 
-class TestRunnerThread(QThread):
-    # Signals for real-time logging and completion status
-    log_signal = pyqtSignal(str, str, object)
-    finished_signal = pyqtSignal(str)
+# === Model backing the External Variables table ===
+class VariablesTableModel(QAbstractTableModel):
+    HEADERS = ["Variable Info", "Value Control", "Action"]
+    COL_INFO, COL_VALUE, COL_ACTION = range(3)
 
-    def __init__(self, file_path, test_cases, tags, runs, options):
-        super().__init__()
-        self.file_path = file_path
-        self.test_cases = test_cases
-        self.tags = tags
-        self.runs = runs
-        self.options = options
+    def __init__(self, variables, help_icon, parent=None):
+        super().__init__(parent)
+        self.variables = variables
+        self.help_icon = help_icon
+
+    def set_variables(self, variables):
+        # Swap the backing list (e.g. after loading from disk)
+        self.beginResetModel()
+        self.variables = variables
+        self.endResetModel()
+
+    def append_variable(self, var):
+        row = len(self.variables)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.variables.append(var)
+        self.endInsertRows()
+
+    def remove_variable(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.variables[row]
+        self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.variables)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == self.COL_VALUE:
+            if self.variables[index.row()]["type"] == "boolean":
+                return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+            return Qt.ItemIsEnabled | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        var = self.variables[index.row()]
+        col = index.column()
+
+        if col == self.COL_INFO:
+            if role == Qt.DisplayRole:
+                return var["name"]
+            if var.get("description"):
+                if role == Qt.ToolTipRole:
+                    return var["description"]
+                if role == Qt.DecorationRole:
+                    return self.help_icon
+
+        elif col == self.COL_VALUE:
+            value = var.get("value", var.get("default", ""))
+            if var["type"] == "boolean":
+                if role == Qt.CheckStateRole:
+                    return Qt.Checked if value.lower() == "true" else Qt.Unchecked
+            elif role == Qt.DisplayRole:
+                return "\u2022" * len(value) if var["type"] == "password" else value
+            elif role == Qt.EditRole:
+                return value
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() != self.COL_VALUE:
+            return False
+        var = self.variables[index.row()]
+        if role == Qt.CheckStateRole:
+            var["value"] = str(value == Qt.Checked)
+        elif role == Qt.EditRole:
+            var["value"] = str(value)
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
 
-    def run(self):
+
+# === Delegate creating value editors on demand and drawing the delete action ===
+class VarDelegate(QStyledItemDelegate):
+    delete_requested = pyqtSignal(int)
+
+    def createEditor(self, parent, option, index):
+        # Factory creating the appropriate editor based on variable type
+        if index.column() != VariablesTableModel.COL_VALUE:
+            return None
+        var = index.model().variables[index.row()]
+        vtype = var["type"]
+
+        if vtype == "integer":
+            widget = QSpinBox(parent)
+            widget.setRange(-999999, 999999)
+            return widget
+
+        elif vtype == "choice":
+            widget = QComboBox(parent)
+            widget.addItems(var.get("options", []))
+            return widget
+
+        elif vtype == "password":
+            widget = QLineEdit(parent)
+            widget.setEchoMode(QLineEdit.Password)
+            return widget
+
+        elif vtype == "boolean":
+            # Booleans are toggled in place via the check state
+            return None
+
+        else:  # Default is String
+            return QLineEdit(parent)
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.EditRole) or ""
+        if isinstance(editor, QSpinBox):
+            try:
+                editor.setValue(int(value))
+            except ValueError as e:
+                editor.setValue(0)
+                print(f"Error loading vars: {e}")
+        elif isinstance(editor, QComboBox):
+            editor.setCurrentText(value)
+        elif isinstance(editor, QLineEdit):
+            editor.setText(value)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QSpinBox):
+            model.setData(index, str(editor.value()))
+        elif isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText())
+        elif isinstance(editor, QLineEdit):
+            model.setData(index, editor.text())
+
+    def paint(self, painter, option, index):
+        if index.column() != VariablesTableModel.COL_ACTION:
+            return super().paint(painter, option, index)
+        # Draw a red "X" instead of instantiating a button per row
+        painter.save()
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QPen(_C_RED))
+        painter.drawText(option.rect, Qt.AlignCenter, "X")
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        if index.column() == VariablesTableModel.COL_ACTION:
+            return QSize(30, 25)
+        return super().sizeHint(option, index)
+
+    def editorEvent(self, event, model, option, index):
+        if index.column() == VariablesTableModel.COL_ACTION:
+            if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+                self.delete_requested.emit(index.row())
+                return True
+            return False
+        return super().editorEvent(event, model, option, index)
+
+
+# === Checkable list model used for test case and tag selection ===
+class TestListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.tooltips = []
+        self._checked = bytearray()
+
+    def set_items(self, names, tooltips=()):
+        # Replace all entries at once; every entry starts unchecked
+        self.beginResetModel()
+        self.names = list(names)
+        self.tooltips = list(tooltips)
+        self._checked = bytearray(len(self.names))
+        self.endResetModel()
+
+    def set_all_checked(self, checked):
+        # One byte fill and at most one dataChanged, however many rows there are
+        n = len(self._checked)
+        value = 1 if checked else 0
+        if not n or self._checked.count(value) == n:
+            return  # Nothing changes, so listeners are not notified at all
+        self._checked[:] = bytes([value]) * n
+        self.dataChanged.emit(self.index(0), self.index(n - 1), [Qt.CheckStateRole])
+
+    def checked_names(self):
+        return [name for name, c in zip(self.names, self._checked) if c]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self.names[row]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self._checked[row] else Qt.Unchecked
+        if role == Qt.ToolTipRole and row < len(self.tooltips) and self.tooltips[row]:
+            return self.tooltips[row]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        self._checked[index.row()] = value == Qt.Checked
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+
+class RunnerWorker(QObject):
+    # Lives on a long-lived QThread; runs are queued to it through do_run
+    log_signal = pyqtSignal(str, object, object)
+    finished_signal = pyqtSignal(str)
+
+    @pyqtSlot(str, object, object, int, object)
+    def do_run(self, file_path, test_cases, tags, runs, options):
         # Calls the core robot execution function
-        output_dir = run_tests_api(
-            self.file_path, self.test_cases, self.tags,
-            self.runs, self.options, self.emit_log
-        )
+        output_dir = run_tests_api(file_path, test_cases, tags, runs, options, self.emit_log)
         self.finished_signal.emit(output_dir)
 
     def emit_log(self, msg_type, message, payload):
         self.log_signal.emit(msg_type, message, payload)
 
 
+class FileWriterSignals(QObject):
+    failed = pyqtSignal(str, str)
+
+
+class FileWriter(QRunnable):
+    # Writes pre-serialized bytes to disk on a thread pool thread
+    def __init__(self, path, data, signals):
+        super().__init__()
+        self.path = path
+        self.data = data
+        self.signals = signals
+
+    def run(self):
+        try:
+            with open(self.path, "wb") as f:
+                f.write(self.data)
+        except Exception as e:
+            self.signals.failed.emit(self.path, str(e))
+
+
+class ParseFileSignals(QObject):
+    finished = pyqtSignal(str, object, object)
+
+
+class ParseFileTask(QRunnable):
+    # Parses a .robot file on a thread pool thread
+    def __init__(self, file_path, signals):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = signals
+
+    def run(self):
+        test_cases, all_tags = parse_robot_file(self.file_path)
+        self.signals.finished.emit(self.file_path, test_cases, all_tags)
+
+
 class RobotControlPanel(QMainWindow):
+    # Queued across threads to RunnerWorker.do_run
+    run_requested = pyqtSignal(str, object, object, int, object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Robot Framework Control Panel v0.2.2")
@@ -117,16 +425,52 @@ class RobotControlPanel(QMainWindow):
         self.current_file = None
         self.test_cases = []
         self.all_tags = []
-        self.test_checkboxes = []
-        self.tag_checkboxes = []
 
         # Configuration file paths
         self.config_file = os.path.join(os.path.expanduser("~"), ".robot_control_panel.json")
         self.vars_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "robot_variables.json")
 
         self.param_history = []
+        self._param_history_set = set()  # Mirrors param_history for membership checks
         self.external_variables = []
-        self.var_widgets = {}  # Stores references to dynamic variable widgets
+        self._help_icon = QIcon.fromTheme("help-about")  # Looked up once, shared by all rows
+        # Digest of the bytes last read from / written to each file, used to skip no-op saves
+        self._last_vars_digest = None
+        self._last_config_digest = None
+
+        # Saves are debounced and written in order on a single background thread
+        self._io_pool = QThreadPool(self)
+        self._io_pool.setMaxThreadCount(1)
+        self._writer_signals = FileWriterSignals(self)
+        self._writer_signals.failed.connect(self._on_save_failed)
+        self._parse_signals = ParseFileSignals(self)
+        self._parse_signals.finished.connect(self._on_test_cases_loaded)
+        self._save_vars_timer = QTimer(self)
+        self._save_vars_timer.setSingleShot(True)
+        self._save_vars_timer.setInterval(500)
+        self._save_vars_timer.timeout.connect(self._do_save_variables)
+        self._save_config_timer = QTimer(self)
+        self._save_config_timer.setSingleShot(True)
+        self._save_config_timer.setInterval(500)
+        self._save_config_timer.timeout.connect(self._do_save_config)
+
+        # Log lines and tree events are buffered and flushed together on a timer
+        self._log_buf = []
+        self._tree_events = []
+        self._item_pool = []  # Result tree items recycled between runs
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(50)
+        self._flush_timer.timeout.connect(self._flush_logs)
+
+        # A single worker thread is started once and reused for every run
+        self._runner_thread = QThread(self)
+        self._worker = RunnerWorker()
+        self._worker.moveToThread(self._runner_thread)
+        self._worker.log_signal.connect(self.handle_log)
+        self._worker.finished_signal.connect(self.tests_finished)
+        self.run_requested.connect(self._worker.do_run)
+        self._runner_thread.finished.connect(self._worker.deleteLater)
+        self._runner_thread.start()
 
         self.init_ui()
         self.load_config()
@@ -151,9 +495,19 @@ class RobotControlPanel(QMainWindow):
         self.tabs = QTabWidget()
         main_layout.addWidget(self.tabs)
 
+        # The variables model is needed before its view exists
+        self.vars_model = VariablesTableModel(self.external_variables, self._help_icon, self)
+
         self.setup_runner_tab()
-        self.setup_settings_tab()
-        self.setup_env_tab()
+
+        # Settings and Environment tabs start as empty placeholders and are built on first use
+        self._settings_tab = QWidget()
+        self._env_tab = QWidget()
+        self._settings_built = False
+        self._env_built = False
+        self.tabs.addTab(self._settings_tab, "Run Settings")
+        self.tabs.addTab(self._env_tab, "Environment")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
         # Run button area
         action_layout = QHBoxLayout()
@@ -187,13 +541,13 @@ class RobotControlPanel(QMainWindow):
         # Test Case Selection Panel
         tc_widget = QWidget()
         tc_layout = QVBoxLayout(tc_widget)
-        self.tests_layout = QVBoxLayout()
-        tc_scroll = QScrollArea()
+        self.tests_model = TestListModel(self)
+        self.test_list_view = QListView()
+        self.test_list_view.setModel(self.tests_model)
+        self.test_list_view.setUniformItemSizes(True)
         tc_group = QGroupBox("Test Cases")
-        tc_group.setLayout(self.tests_layout)
-        tc_scroll.setWidget(tc_group)
-        tc_scroll.setWidgetResizable(True)
-        tc_layout.addWidget(tc_scroll)
+        QVBoxLayout(tc_group).addWidget(self.test_list_view)
+        tc_layout.addWidget(tc_group)
 
         # Test Case Selection Buttons
         tc_btns = QHBoxLayout()
@@ -208,13 +562,13 @@ class RobotControlPanel(QMainWindow):
         # Tag Selection Panel
         tag_widget = QWidget()
         tag_layout = QVBoxLayout(tag_widget)
-        self.tags_layout = QVBoxLayout()
-        tag_scroll = QScrollArea()
+        self.tags_model = TestListModel(self)
+        self.tag_list_view = QListView()
+        self.tag_list_view.setModel(self.tags_model)
+        self.tag_list_view.setUniformItemSizes(True)
         tag_group = QGroupBox("Tags")
-        tag_group.setLayout(self.tags_layout)
-        tag_scroll.setWidget(tag_group)
-        tag_scroll.setWidgetResizable(True)
-        tag_layout.addWidget(tag_scroll)
+        QVBoxLayout(tag_group).addWidget(self.tag_list_view)
+        tag_layout.addWidget(tag_group)
 
         selection_tabs.addTab(tc_widget, "Test Cases")
         selection_tabs.addTab(tag_widget, "Tags")
@@ -229,6 +583,11 @@ class RobotControlPanel(QMainWindow):
         results_layout.addWidget(self.results_tree, 1)
         self.results_text = QTextBrowser()
         self.results_text.setFont(QFont("Consolas", 9))
+        self.results_text.setUndoRedoEnabled(False)
+        # Keep only the most recent lines so long sessions don't slow down painting
+        self.results_text.document().setMaximumBlockCount(5000)
+        self._log_cursor = QTextCursor(self.results_text.document())
+        self._log_cursor.movePosition(QTextCursor.End)
         results_layout.addWidget(self.results_text, 1)
         splitter.addWidget(results_widget)
         splitter.setSizes([400, 800])  # Initial split sizes
@@ -236,9 +595,26 @@ class RobotControlPanel(QMainWindow):
         layout.addWidget(splitter)
         self.tabs.addTab(runner_tab, "Runner")
 
-    def setup_settings_tab(self):
+    def _on_tab_changed(self, index):
+        widget = self.tabs.widget(index)
+        if widget is self._settings_tab:
+            self._ensure_settings_tab()
+        elif widget is self._env_tab:
+            self._ensure_env_tab()
+
+    def _ensure_settings_tab(self):
+        if not self._settings_built:
+            self._settings_built = True
+            self.setup_settings_tab(self._settings_tab)
+            self._populate_params_combo()
+
+    def _ensure_env_tab(self):
+        if not self._env_built:
+            self._env_built = True
+            self.setup_env_tab(self._env_tab)
+
+    def setup_settings_tab(self, settings_tab):
         # Set up the run configuration and external variables tab
-        settings_tab = QWidget()
 
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -258,6 +634,9 @@ class RobotControlPanel(QMainWindow):
         self.runs_spin = QSpinBox()
         self.runs_spin.setRange(1, 100)
         hbox_runs.addWidget(self.runs_spin)
+        # Multiple runs execute in parallel unless this is checked
+        self.chk_sequential = QCheckBox("Run sequentially (for suites sharing browsers, ports or files)")
+        hbox_runs.addWidget(self.chk_sequential)
         hbox_runs.addStretch()
 
         # Log Level combo box
@@ -290,9 +669,12 @@ class RobotControlPanel(QMainWindow):
         group_vars = QGroupBox("External Variables")
         vars_layout = QVBoxLayout()
 
-        self.vars_table = QTableWidget()
-        self.vars_table.setColumnCount(3)
-        self.vars_table.setHorizontalHeaderLabels(["Variable Info", "Value Control", "Action"])
+        self.vars_delegate = VarDelegate(self)
+        self.vars_delegate.delete_requested.connect(self.delete_variable, Qt.QueuedConnection)
+        self.vars_table = QTableView()
+        self.vars_table.setModel(self.vars_model)
+        self.vars_table.setItemDelegate(self.vars_delegate)
+        self.vars_table.setEditTriggers(QAbstractItemView.AllEditTriggers)
         self.vars_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.vars_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.vars_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
@@ -331,34 +713,26 @@ class RobotControlPanel(QMainWindow):
         tab_main_layout = QVBoxLayout(settings_tab)
         tab_main_layout.addWidget(scroll)
 
-        self.tabs.addTab(settings_tab, "Run Settings")
-
-    def setup_env_tab(self):
+    def setup_env_tab(self, env_tab):
         # Set up the environment information tab
-        env_tab = QWidget()
         layout = QVBoxLayout(env_tab)
         btn_refresh = QPushButton("Refresh Environment Info")
-        btn_refresh.clicked.connect(self.refresh_env_info)
+        btn_refresh.clicked.connect(lambda: self.refresh_env_info(force=True))
         layout.addWidget(btn_refresh)
         self.env_table = QTableWidget()
         self.env_table.setColumnCount(2)
         self.env_table.setHorizontalHeaderLabels(["Component", "Version/Path"])
         self.env_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.env_table)
-        self.tabs.addTab(env_tab, "Environment")
         self.refresh_env_info()
 
     # === Variable Management Logic ===
 
     def load_variables(self):
         # Load external variables from JSON file
-        if os.path.exists(self.vars_file):
-            try:
-                with open(self.vars_file, "r", encoding="utf-8") as f:
-                    self.external_variables = json.load(f)
-            except Exception as e:
-                print(f"Error loading vars: {e}")
-        else:
+        try:
+            self.external_variables, self._last_vars_digest = _load_json_file(self.vars_file)
+        except FileNotFoundError:
             # Create a default variable if file doesn't exist
             self.external_variables = [{
                 "name": "HEADLESS",
@@ -368,109 +742,28 @@ class RobotControlPanel(QMainWindow):
                 "value": "True"
             }]
             self.save_variables()
+        except Exception as e:
+            print(f"Error loading vars: {e}")
 
         self.render_variables()
 
     def save_variables(self):
-        # Update variable values from UI before saving
-        self.update_variable_values_from_ui()
-        try:
-            with open(self.vars_file, "w", encoding="utf-8") as f:
-                json.dump(self.external_variables, f, indent=2)
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to save variables: {e}")
-
-    def update_variable_values_from_ui(self):
-        # Read current values from the dynamic widgets
-        for var in self.external_variables:
-            name = var["name"]
-            widget = self.var_widgets.get(name)
-            if widget:
-                val = ""
-                vtype = var["type"]
-
-                if vtype == "boolean":
-                    val = str(widget.isChecked())
-                elif vtype == "integer":
-                    val = str(widget.value())
-                elif vtype == "choice":
-                    val = widget.currentText()
-                elif vtype == "string" or vtype == "password":
-                    val = widget.text()
-
-                var["value"] = val
+        # Schedule a save; rapid successive calls result in a single write
+        self._save_vars_timer.start()
+
+    def _do_save_variables(self):
+        # The table model edits self.external_variables in place, so it is always current
+        self._save_vars_timer.stop()
+        data = _dumps_json(self.external_variables, indent=True)
+        digest = _digest(data)
+        if digest == self._last_vars_digest:
+            return
+        self._last_vars_digest = digest
+        self._io_pool.start(FileWriter(self.vars_file, data, self._writer_signals))
 
     def render_variables(self):
-        # Render the variable table based on self.external_variables
-        self.vars_table.setRowCount(0)
-        self.var_widgets = {}
-
-        for row, var in enumerate(self.external_variables):
-            self.vars_table.insertRow(row)
-
-            # Column 0: Variable Info
-            name_item = QTableWidgetItem(var["name"])
-            name_item.setFlags(Qt.ItemIsEnabled)
-            if var.get("description"):
-                name_item.setToolTip(var["description"])
-                name_item.setIcon(QIcon.fromTheme("help-about"))
-            self.vars_table.setItem(row, 0, name_item)
-
-            # Column 1: Value Control Widget (Checkbox, SpinBox, LineEdit, etc.)
-            control_widget = self.create_control_for_var(var)
-            self.var_widgets[var["name"]] = control_widget
-            self.vars_table.setCellWidget(row, 1, control_widget)
-
-            # Column 2: Delete Button
-            btn_del = QPushButton("X")
-            btn_del.setFixedSize(30, 25)
-            btn_del.setStyleSheet("color: red; font-weight: bold;")
-            btn_del.clicked.connect(lambda checked, r=row: self.delete_variable(r))
-
-            cell_widget = QWidget()
-            layout = QHBoxLayout(cell_widget)
-            layout.setContentsMargins(0, 0, 0, 0)
-            layout.setAlignment(Qt.AlignCenter)
-            layout.addWidget(btn_del)
-            self.vars_table.setCellWidget(row, 2, cell_widget)
-
-    def create_control_for_var(self, var):
-        # Factory function to create appropriate widget based on variable type
-        vtype = var["type"]
-        default_val = var.get("value", var.get("default", ""))
-
-        if vtype == "boolean":
-            widget = QCheckBox()
-            widget.setChecked(default_val.lower() == "true")
-            return widget
-
-        elif vtype == "integer":
-            widget = QSpinBox()
-            widget.setRange(-999999, 999999)
-            try:
-                widget.setValue(int(default_val))
-            except Exception as e:
-                widget.setValue(0)
-                print(f"Error loading vars: {e}")
-            return widget
-
-        elif vtype == "choice":
-            widget = QComboBox()
-            options = var.get("options", [])
-            widget.addItems(options)
-            widget.setCurrentText(default_val)
-            return widget
-
-        elif vtype == "password":
-            widget = QLineEdit()
-            widget.setEchoMode(QLineEdit.Password)
-            widget.setText(default_val)
-            return widget
-
-        else:  # Default is String
-            widget = QLineEdit()
-            widget.setText(default_val)
-            return widget
+        # Point the variable table model at the current self.external_variables
+        self.vars_model.set_variables(self.external_variables)
 
     def add_variable_dialog(self):
         # Open dialog to add a new variable
@@ -486,9 +779,8 @@ class RobotControlPanel(QMainWindow):
                     QMessageBox.warning(self, "Error", "Variable already exists!")
                     return
 
-            self.external_variables.append(data)
+            self.vars_model.append_variable(data)
             self.save_variables()
-            self.render_variables()
 
     def delete_variable(self, row_index):
         # Delete a variable from the list
@@ -498,14 +790,16 @@ class RobotControlPanel(QMainWindow):
                                          f"Delete variable '{name}'?",
                                          QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if reply == QMessageBox.Yes:
-                del self.external_variables[row_index]
+                self.vars_model.remove_variable(row_index)
                 self.save_variables()
-                self.render_variables()
 
     # === Standard Logic (File, Env, Run) ===
 
-    def refresh_env_info(self):
+    def refresh_env_info(self, force=False):
         # Get and display system and Robot Framework environment info
+        if force:
+            # Drop the copy memoized by robot_core so upgraded packages show up
+            get_environment_info.cache_clear()
         info = get_environment_info()
         rows = [("Python", info["python_version"]), ("Robot Framework", info["robot_version"])] + info["libraries"]
         self.env_table.setRowCount(len(rows))
@@ -518,56 +812,73 @@ class RobotControlPanel(QMainWindow):
         fp, _ = QFileDialog.getOpenFileName(self, "Select Robot File", "", "Robot Files (*.robot)")
         if fp:
             self.current_file = fp
-            self.file_path_label.setText(fp)
             self.load_test_cases(fp)
 
     def load_test_cases(self, fp):
-        # Parse file and populate the test case and tag checkboxes
-        for cb in self.test_checkboxes + self.tag_checkboxes:
-            cb.deleteLater()
-        self.test_checkboxes, self.tag_checkboxes = [], []
-        self.test_cases, self.all_tags = parse_robot_file(fp)
-        for tc in self.test_cases:
-            cb = QCheckBox(tc["name"])
-            if tc["documentation"]:
-                cb.setToolTip(tc["documentation"])
-            self.tests_layout.addWidget(cb)
-            self.test_checkboxes.append(cb)
-        for tag in self.all_tags:
-            cb = QCheckBox(tag)
-            self.tags_layout.addWidget(cb)
-            self.tag_checkboxes.append(cb)
+        # Parse the file in the background; the selection stays empty until it is done
+        self.file_path_label.setText("Loading...")
+        self.test_cases, self.all_tags = [], []
+        self.tests_model.set_items([])
+        self.tags_model.set_items([])
+        QThreadPool.globalInstance().start(ParseFileTask(fp, self._parse_signals))
+
+    def _on_test_cases_loaded(self, fp, test_cases, all_tags):
+        # Populate the test case and tag selection models
+        if fp != self.current_file:
+            return  # A newer file was selected while this one was parsing
+        self.file_path_label.setText(fp)
+        self.test_cases, self.all_tags = test_cases, all_tags
+        self.tests_model.set_items([tc["name"] for tc in self.test_cases],
+                                   [tc["documentation"] for tc in self.test_cases])
+        self.tags_model.set_items(self.all_tags)
 
     def select_all_tests(self):
-        for cb in self.test_checkboxes:
-            cb.setChecked(True)
+        self.tests_model.set_all_checked(True)
 
     def deselect_all_tests(self):
-        for cb in self.test_checkboxes:
-            cb.setChecked(False)
+        self.tests_model.set_all_checked(False)
 
     def load_config(self):
         # Load history of additional parameters
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, "r") as f:
-                    cfg = json.load(f)
-                    self.param_history = cfg.get("param_history", [])
-                    self.params_combo.clear()
-                    self.params_combo.addItems(self.param_history)
-                    self.params_combo.setCurrentText("")
+            cfg, self._last_config_digest = _load_json_file(self.config_file)
+            self.param_history = cfg.get("param_history", [])
+            self._param_history_set = set(self.param_history)
+            if self._settings_built:
+                self._populate_params_combo()
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Error load config: {e}")
             pass
 
+    def _populate_params_combo(self):
+        self.params_combo.clear()
+        self.params_combo.addItems(self.param_history)
+        self.params_combo.setCurrentText("")
+
     def save_config(self):
+        # Schedule a save of the parameter history
+        self._save_config_timer.start()
+
+    def _do_save_config(self):
         # Save history of additional parameters
-        try:
-            with open(self.config_file, "w") as f:
-                json.dump({"param_history": self.param_history}, f)
-        except Exception as e:
-            print(f"Error saving config: {e}")
-            pass
+        self._save_config_timer.stop()
+        data = _dumps_json({"param_history": self.param_history})
+        digest = _digest(data)
+        if digest == self._last_config_digest:
+            return
+        self._last_config_digest = digest
+        self._io_pool.start(FileWriter(self.config_file, data, self._writer_signals))
+
+    def _on_save_failed(self, path, error):
+        # Forget the failed write so the next save retries it
+        if path == self.vars_file:
+            self._last_vars_digest = None
+            QMessageBox.warning(self, "Error", f"Failed to save variables: {error}")
+        else:
+            self._last_config_digest = None
+            print(f"Error saving config: {error}")
 
     def on_params_changed(self, t):
         # Placeholder for future logic, currently just passes
@@ -576,7 +887,8 @@ class RobotControlPanel(QMainWindow):
     def delete_param(self):
         # Delete parameter from history
         ct = self.params_combo.currentText()
-        if ct in self.param_history:
+        if ct in self._param_history_set:
+            self._param_history_set.discard(ct)
             self.param_history.remove(ct)
             self.params_combo.removeItem(self.params_combo.currentIndex())
             self.save_config()
@@ -586,34 +898,41 @@ class RobotControlPanel(QMainWindow):
         if not self.current_file:
             return QMessageBox.warning(self, "Error", "Select file first.")
 
+        # Run options are read from the Settings tab widgets
+        self._ensure_settings_tab()
+
         # Collect selected tests and tags
-        sel_tests = [self.test_cases[i]["name"] for i, cb in enumerate(self.test_checkboxes) if cb.isChecked()]
-        sel_tags = [self.all_tags[i] for i, cb in enumerate(self.tag_checkboxes) if cb.isChecked()]
+        sel_tests = self.tests_model.checked_names()
+        sel_tags = self.tags_model.checked_names()
         if not sel_tests and not sel_tags:
             return QMessageBox.warning(self, "Error", "Select test or tag.")
 
         # Handle additional CLI arguments history
         add_args = self.params_combo.currentText().strip()
-        if add_args and add_args not in self.param_history:
+        if add_args and add_args not in self._param_history_set:
+            self._param_history_set.add(add_args)
             self.param_history.insert(0, add_args)
             self.params_combo.insertItem(0, add_args)
             self.save_config()
 
-        # Update and save current variable values
-        self.update_variable_values_from_ui()
+        # Save current variable values
         self.save_variables()
 
         # Format variables for Robot Framework CLI
         variables_list = [f"{var['name']}:{var['value']}" for var in self.external_variables]
 
-        # UI cleanup before run
-        self.run_button.setEnabled(False)
-        self.run_button.setText("Running...")
-        self.results_text.clear()
-        self.results_tree.clear()
-        self.current_tree_items = {}
-        self.log_btn.setVisible(False)
-        self.report_btn.setVisible(False)
+        # UI cleanup before run, repainted once when updates are re-enabled
+        self.setUpdatesEnabled(False)
+        try:
+            self.run_button.setEnabled(False)
+            self.run_button.setText("Running...")
+            self.results_text.clear()
+            self._recycle_tree_items()
+            self.current_tree_items = {}
+            self.log_btn.setVisible(False)
+            self.report_btn.setVisible(False)
+        finally:
+            self.setUpdatesEnabled(True)
 
         # --- MILESTONE 0.2.2: Handle empty string for default loglevel ---
         selected_loglevel = self.combo_loglevel.currentText()
@@ -621,6 +940,7 @@ class RobotControlPanel(QMainWindow):
         options = {
             "dryrun": self.chk_dryrun.isChecked(),
             "exitonfailure": self.chk_exitonfail.isChecked(),
+            "sequential": self.chk_sequential.isChecked(),
             "outputdir": self.edit_output_dir.text(),
             "additional_args": add_args,
             "variables_list": variables_list
@@ -631,47 +951,107 @@ class RobotControlPanel(QMainWindow):
             options["loglevel"] = selected_loglevel
         # ----------------------------------------------------------------
 
-        # Start the runner thread
-        self.runner_thread = TestRunnerThread(self.current_file, sel_tests, sel_tags, self.runs_spin.value(), options)
-        self.runner_thread.log_signal.connect(self.handle_log)
-        self.runner_thread.finished_signal.connect(self.tests_finished)
-        self.runner_thread.start()
+        # Hand the run to the worker thread
+        self._log_buf.clear()
+        self._tree_events.clear()
+        self._flush_timer.start()
+        self.run_requested.emit(self.current_file, sel_tests, sel_tags, self.runs_spin.value(), options)
 
     def handle_log(self, mt, msg, pl):
-        # Handle real-time logs from the runner thread
-        if mt == "log":
-            c = "black"
-            if "[WARN]" in msg:
-                c = "orange"
-            if "[FAIL]" in msg:
-                c = "red"
-            self.results_text.append(f'<span style="color:{c}">{msg}</span>')
-        elif mt == "start_test":
-            tn = msg.replace("START: ", "")
-            item = QTreeWidgetItem(self.results_tree)
-            item.setText(0, tn)
-            item.setText(1, "Running...")
-            item.setBackground(1, QColor("yellow"))
-            self.current_tree_items[tn] = item
-            self.results_tree.scrollToItem(item)
-        elif mt == "end_test":
-            tn = msg.split(" [")[0].replace("END: ", "")
-            st = pl['status']
-            if tn in self.current_tree_items:
-                it = self.current_tree_items[tn]
-                it.setText(1, st)
-                it.setBackground(1, QColor("#ccffcc") if st == "PASS" else QColor("#ffcccc"))
-                if st != "PASS":
-                    it.setExpanded(True)
+        # Queue real-time logs from the runner thread until the next flush
+        if mt == "log_batch":
+            get_fmt = _FMT_BY_LEVEL.get
+            self._log_buf.extend((line, get_fmt(line[:line.find("]") + 1], _FMT_DEFAULT)) for line in msg)
+        elif mt == "log":
+            fmt = _FMT_BY_LEVEL.get(msg[:msg.find("]") + 1], _FMT_DEFAULT)
+            self._log_buf.append((msg, fmt))
+        elif mt in ("start_test", "end_test"):
+            self._tree_events.append((mt, msg, pl))
+        elif mt == "error":
+            # Runner start-up failures and crashes would otherwise only show "Done"
+            self._log_buf.append((msg, _FMT_ERROR))
+        elif mt == "info":
+            self._log_buf.append((msg, _FMT_DEFAULT))
+
+    def _flush_logs(self):
+        # Apply everything queued by handle_log in one pass
+        if self._log_buf:
+            cursor = self._log_cursor
+            cursor.movePosition(QTextCursor.End)
+            cursor.beginEditBlock()
+            for line, fmt in self._log_buf:
+                if not self.results_text.document().isEmpty():
+                    cursor.insertBlock()
+                cursor.insertText(line, fmt)
+            cursor.endEditBlock()
+            cursor.setCharFormat(QTextCharFormat())
+            self.results_text.setTextCursor(cursor)
+            self._log_buf.clear()
+        if self._tree_events:
+            self.results_tree.setUpdatesEnabled(False)
+            try:
+                self._apply_tree_events()
+            finally:
+                self.results_tree.setUpdatesEnabled(True)
+
+    def _recycle_tree_items(self):
+        # Return the previous run's items to the pool instead of deleting them
+        tree = self.results_tree
+        while tree.topLevelItemCount():
+            self._item_pool.append(tree.takeTopLevelItem(tree.topLevelItemCount() - 1))
+
+    def _apply_tree_events(self):
+        last_started = None
+        for mt, msg, pl in self._tree_events:
+            # Parallel runs report the same test names, so items are keyed per run
+            key = (pl.get("run"), pl["name"])
+            if mt == "start_test":
+                tn = pl["name"] if key[0] is None else f"{pl['name']} (run {key[0]})"
+                item = self._item_pool.pop() if self._item_pool else QTreeWidgetItem()
+                self.results_tree.addTopLevelItem(item)
+                item.setExpanded(False)
+                item.setText(0, tn)
+                item.setText(1, "Running...")
+                item.setBackground(1, _C_YELLOW)
+                self.current_tree_items[key] = item
+                last_started = item
+            else:
+                st = pl["status"]
+                if key in self.current_tree_items:
+                    it = self.current_tree_items[key]
+                    it.setText(1, st)
+                    it.setBackground(1, _C_PASS if st == "PASS" else _C_FAIL)
+                    if st != "PASS":
+                        it.setExpanded(True)
+        self._tree_events.clear()
+        if last_started is not None:
+            self.results_tree.scrollToItem(last_started)
 
     def tests_finished(self, od):
         # Handler after thread completes
-        self.run_button.setEnabled(True)
-        self.run_button.setText("Run Selected Tests")
+        self._flush_timer.stop()
         self.last_output_dir = od
-        self.results_text.append("\n=== Done ===")
-        self.log_btn.setVisible(True)
-        self.report_btn.setVisible(True)
+        self.setUpdatesEnabled(False)
+        try:
+            self._flush_logs()
+            self.run_button.setEnabled(True)
+            self.run_button.setText("Run Selected Tests")
+            self.results_text.append("\n=== Done ===")
+            self.log_btn.setVisible(True)
+            self.report_btn.setVisible(True)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def closeEvent(self, event):
+        # Flush pending saves, then let an in-progress run finish before the worker thread is torn down
+        if self._save_vars_timer.isActive():
+            self._do_save_variables()
+        if self._save_config_timer.isActive():
+            self._do_save_config()
+        self._io_pool.waitForDone()
+        self._runner_thread.quit()
+        self._runner_thread.wait()
+        super().closeEvent(event)
 
     def open_report(self, fn):
         # Open HTML reports in the default web browser
@@ -683,6 +1063,7 @@ class RobotControlPanel(QMainWindow):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Parallel runs use worker processes, also in frozen builds
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setFont(QFont("Segoe UI", 9))
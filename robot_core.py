@@ -3,72 +3,284 @@
 import os
 import sys
 import subprocess
-import shlex
-from robot.api import get_model
-from robot import run as robot_run
+import re
+import threading
+import functools
+import copy
+import hashlib
+import pickle
+import multiprocessing
+import queue
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Robot Framework and shlex are imported on first use, so importing this module
+# (e.g. only for get_environment_info) does not load the whole Robot import graph
+@functools.lru_cache(maxsize=None)
+def _get_model():
+    from robot.api import get_model
+    return get_model
+
+
+@functools.lru_cache(maxsize=None)
+def _robot_run():
+    from robot import run
+    return run
+
+
+@functools.lru_cache(maxsize=None)
+def _shlex_split():
+    import shlex
+    return shlex.split
+
+
+# Log lines are handed to the callback in batches of this size, or at least
+# every this many seconds by the listener's flush thread
+_LOG_BATCH_SIZE = 64
+_LOG_BATCH_INTERVAL = 0.05
+
+# Precomputed "[LEVEL] " prefixes for log_message
+_LEVEL_PREFIX = {lvl: f"[{lvl}] " for lvl in ("TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FAIL")}
 
 
 class RealTimeListener:
     """
-    Custom Robot Framework Listener (API V2) to capture real-time events.
+    Custom Robot Framework Listener (API V3) to capture real-time events.
     Sends logs, test start, and test end events back to the GUI thread.
+    Test events carry a payload dict with the test "name" (and "status" on end),
+    plus the 1-based "run" number when there are several runs.
+    Log lines are posted as "log_batch" lists of up to _LOG_BATCH_SIZE lines.
+    A background thread flushes the buffer every _LOG_BATCH_INTERVAL seconds,
+    so lines logged before a blocking keyword are not held back.
     """
-    ROBOT_LISTENER_API_VERSION = 2
+    ROBOT_LISTENER_API_VERSION = 3
 
-    def __init__(self, callback):
+    def __init__(self, callback, run_index=None):
         self.callback = callback
+        self.run_index = run_index
+        self._buf = []
+        # Serializes callbacks from Robot's thread and the flush thread
+        self._lock = threading.Lock()
+        self._stop = None
+        self._flusher = None
+
+    def _flush(self):
+        # Caller holds self._lock
+        if self._buf:
+            self.callback("log_batch", self._buf, None)
+            self._buf = []
+
+    def _flush_loop(self, stop):
+        while not stop.wait(_LOG_BATCH_INTERVAL):
+            with self._lock:
+                self._flush()
+
+    def start_suite(self, data, result):
+        # The listener may be reused for several runs; each run gets its own flush thread
+        if self._flusher is None:
+            self._stop = threading.Event()
+            self._flusher = threading.Thread(target=self._flush_loop, args=(self._stop,), daemon=True)
+            self._flusher.start()
 
-    def start_test(self, name, attrs):
-        self.callback("start_test", f"START: {name}", attrs)
+    def start_test(self, data, result):
+        name = data.name
+        with self._lock:
+            self._flush()
+            self.callback("start_test", f"START: {name}", {"name": name, "run": self.run_index})
 
-    def end_test(self, name, attrs):
-        status = attrs['status']
-        self.callback("end_test", f"END: {name} [{status}]", attrs)
+    def end_test(self, data, result):
+        name, status = data.name, result.status
+        with self._lock:
+            self._flush()
+            self.callback("end_test", f"END: {name} [{status}]",
+                          {"name": name, "status": status, "run": self.run_index})
 
     def log_message(self, message):
-        msg_str = f"[{message['level']}] {message['message']}"
-        self.callback("log", msg_str, None)
+        level = message.level
+        line = (_LEVEL_PREFIX.get(level) or f"[{level}] ") + message.message
+        with self._lock:
+            self._buf.append(line)
+            if len(self._buf) >= _LOG_BATCH_SIZE:
+                self._flush()
+
+    def close(self):
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            self._flush()
+
+
+# Token and statement types inspected while walking the parsed model
+_ARGUMENT = "ARGUMENT"
+_DOCUMENTATION = "DOCUMENTATION"
+_TAGS = "TAGS"
+_TEST_CASES = "Test Cases"
+
+_PARSE_CACHE_MAX = 256
+_PARSE_CACHE = OrderedDict()  # (abspath, mtime_ns, size) -> (test_cases_data, sorted_tags)
+_PARSE_CACHE_LOCK = threading.Lock()
+# Per-user directory, so other local users cannot plant pickles that get loaded
+_PARSE_DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "robot_control_panel")
+
+
+def _parse_disk_cache_enabled():
+    return os.environ.get("ROBOT_PANEL_PARSE_CACHE") == "1"
+
+
+def _parse_disk_cache_path(abs_path):
+    name = hashlib.blake2b(abs_path.encode(), digest_size=16).hexdigest() + ".pkl"
+    return os.path.join(_PARSE_DISK_CACHE_DIR, name)
+
+
+def _load_parse_disk_cache(abs_path, st):
+    """Returns the pickled parse result for abs_path if it matches the file's mtime and size."""
+    try:
+        with open(_parse_disk_cache_path(abs_path), "rb") as f:
+            entry = pickle.load(f)
+        if entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry["data"]
+    except Exception:
+        pass
+    return None
+
+
+def _store_parse_disk_cache(abs_path, st, data):
+    cache_path = _parse_disk_cache_path(abs_path)
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(_PARSE_DISK_CACHE_DIR, mode=0o700, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"Error writing parse cache for {abs_path}: {e}")
+
+
+def _parse_model(file_path):
+    """Walks the Robot Framework model of a file and collects test cases and tags."""
+    _hasattr = hasattr  # Local binding; this walk visits every node of the model
+    # data_only drops comments, separators and empty lines, so there is less to walk
+    model = _get_model()(file_path, data_only=True, curdir=os.path.dirname(os.path.abspath(file_path)))
+    test_cases_data = []
+    all_tags = set()
+    tag_add = all_tags.add
+
+    # A file may contain several Test Cases sections
+    test_sections = (section for section in model.sections
+                     if getattr(getattr(section, "header", None), "name", None) == _TEST_CASES)
+    for section in test_sections:
+        for test_case in section.body:
+            if not _hasattr(test_case, "name") or not test_case.name:
+                continue
+            doc = ""
+            tags = []
+            tag_append = tags.append
+            for item in test_case.body:
+                if _hasattr(item, "type"):
+                    item_type = item.type
+                    if item_type == _DOCUMENTATION:
+                        # Extract documentation string
+                        doc = " ".join(token.value for token in item.tokens if token.type == _ARGUMENT)
+                    elif item_type == _TAGS:
+                        # Extract tags into the test's list and the global set in one pass
+                        for token in item.tokens:
+                            if token.type == _ARGUMENT:
+                                value = token.value
+                                tag_append(value)
+                                tag_add(value)
+            test_cases_data.append({
+                "name": test_case.name,
+                "documentation": doc,
+                "tags": tags
+            })
+    return test_cases_data, tuple(sorted(all_tags))
 
 
 def parse_robot_file(file_path):
     """
-    Parses a Robot Framework file and returns a list of test cases and unique tags.
+    Parses a Robot Framework file and returns a list of test cases and a
+    sorted tuple of unique tags.
+    Results are cached by (path, mtime, size); callers receive fresh copies of
+    the test case data, while the immutable tag tuple is shared.
+    Use parse_robot_file.cache_clear() to drop the cache.
+    With ROBOT_PANEL_PARSE_CACHE=1 results are also pickled to
+    ~/.cache/robot_control_panel so that later processes can skip parsing
+    unchanged files.
     """
     try:
-        model = get_model(file_path)
-        test_cases_data = []
-        all_tags = set()
-
-        for section in model.sections:
-            if hasattr(section, "header") and section.header and section.header.name == "Test Cases":
-                for test_case in section.body:
-                    if not hasattr(test_case, "name") or not test_case.name:
-                        continue
-                    doc = ""
-                    tags = []
-                    for item in test_case.body:
-                        if hasattr(item, "type"):
-                            if item.type == "DOCUMENTATION":
-                                # Extract documentation string
-                                doc = " ".join(token.value for token in item.tokens if token.type == "ARGUMENT")
-                            elif item.type == "TAGS":
-                                # Extract tags and add to set
-                                current_tags = [token.value for token in item.tokens if token.type == "ARGUMENT"]
-                                tags.extend(current_tags)
-                                all_tags.update(current_tags)
-                    test_cases_data.append({
-                        "name": test_case.name,
-                        "documentation": doc,
-                        "tags": tags
-                    })
-        return test_cases_data, sorted(list(all_tags))
+        st = os.stat(file_path)
+        abs_path = os.path.abspath(file_path)
+        key = (abs_path, st.st_mtime_ns, st.st_size)
+        with _PARSE_CACHE_LOCK:
+            cached = _PARSE_CACHE.get(key)
+            if cached is not None:
+                _PARSE_CACHE.move_to_end(key)
+        if cached is None:
+            use_disk = _parse_disk_cache_enabled()
+            if use_disk:
+                cached = _load_parse_disk_cache(abs_path, st)
+            if cached is None:
+                cached = _parse_model(file_path)
+                if use_disk:
+                    _store_parse_disk_cache(abs_path, st, cached)
+            with _PARSE_CACHE_LOCK:
+                _PARSE_CACHE[key] = cached
+                if len(_PARSE_CACHE) > _PARSE_CACHE_MAX:
+                    _PARSE_CACHE.popitem(last=False)
+        test_cases_data, all_tags = cached
+        return [dict(tc, tags=list(tc["tags"])) for tc in test_cases_data], all_tags
     except Exception as e:
         print(f"Error parsing file {file_path}: {e}")
-        return [], []
+        return [], ()
 
 
-def get_environment_info():
-    """Gathers information about the Python and Robot Framework environment."""
+def _parse_cache_clear():
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE.clear()
+
+
+parse_robot_file.cache_clear = _parse_cache_clear
+
+
+# Name prefixes of the packages listed in the environment info
+_LIB_PREFIXES = ("robotframework", "selenium", "requests")
+# Same prefix match for the package column of `pip list` lines
+_LIB_RE = re.compile("^(?:%s)" % "|".join(map(re.escape, _LIB_PREFIXES)), re.IGNORECASE)
+
+
+def _installed_libraries():
+    """Lists relevant installed packages as (name, version) from the package metadata."""
+    from importlib.metadata import distributions
+    found = {}
+    for dist in distributions():
+        name = dist.metadata["Name"]
+        if name and name.lower().startswith(_LIB_PREFIXES):
+            found.setdefault(name.lower(), (name, dist.version))
+    return [found[key] for key in sorted(found)]
+
+
+def _parse_pip_list(output):
+    """Extracts relevant (name, version) pairs from `pip list` output."""
+    libraries = []
+    for line in output.splitlines():
+        if _LIB_RE.match(line):
+            parts = line.split(maxsplit=2)
+            if len(parts) >= 2:
+                libraries.append((parts[0], parts[1]))
+    return libraries
+
+
+def _pip_list_libraries():
+    """Fallback for interpreters without importlib.metadata: parses `pip list` output."""
+    result = subprocess.run([sys.executable, "-m", "pip", "list"], capture_output=True, text=True)
+    return _parse_pip_list(result.stdout)
+
+
+def _base_environment_info():
     info = {
             "python_version": sys.version.split()[0],
             "executable": sys.executable,
@@ -76,30 +288,201 @@ def get_environment_info():
             "libraries": []
             }
     try:
-        import robot
-        info["robot_version"] = robot.__version__
-    except ImportError:
-        pass
+        # Read from the package metadata; importing robot would load all of Robot Framework
+        from importlib.metadata import version
+        info["robot_version"] = version("robotframework")
+    except Exception:
+        try:
+            import robot
+            info["robot_version"] = robot.__version__
+        except ImportError:
+            pass
+    return info
+
 
-    # Use pip list to find relevant libraries like Selenium, Requests, etc.
+@functools.lru_cache(maxsize=1)
+def _environment_info():
+    info = _base_environment_info()
+
+    # Find relevant libraries like Selenium, Requests, etc.
     try:
-        result = subprocess.run([sys.executable, "-m", "pip", "list"], capture_output=True, text=True)
-        lines = result.stdout.splitlines()
-        for line in lines:
-            if any(x in line.lower() for x in ["robotframework", "selenium", "requests"]):
-                parts = line.split()
-                if len(parts) >= 2:
-                    info["libraries"].append((parts[0], parts[1]))
+        try:
+            info["libraries"] = _installed_libraries()
+        except ImportError:
+            info["libraries"] = _pip_list_libraries()
     except Exception as e:
-        print(f"Error loading vars: {e}")
+        print(f"Error loading libraries: {e}")
         pass
     return info
 
 
+def get_environment_info():
+    """
+    Gathers information about the Python and Robot Framework environment.
+    The result is computed once per process; each call returns a copy.
+    Use get_environment_info.cache_clear() to force a fresh lookup.
+    """
+    return copy.deepcopy(_environment_info())
+
+
+get_environment_info.cache_clear = _environment_info.cache_clear
+
+
+# Additional CLI arguments understood by run_tests_api: option -> (kind, tokens consumed)
+_ARG_TABLE = {
+    "-v": ("variable", 2), "--variable": ("variable", 2),
+    "-i": ("include", 2), "--include": ("include", 2),
+    "-e": ("exclude", 2), "--exclude": ("exclude", 2),
+    "-L": ("loglevel", 2), "--loglevel": ("loglevel", 2),
+    "-d": ("outputdir", 2), "--outputdir": ("outputdir", 2),
+    "--dryrun": ("dryrun", 1),
+    "--randomize": ("randomize", 2),
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_extra_args(extra_args_str):
+    """
+    Parses the additional CLI arguments string entered by the user.
+    Returns (variables, includes, excludes, overrides) where the first three are
+    tuples of values and overrides is a tuple of (robot option, value) pairs in
+    the order given, so later options win when applied with dict.update().
+    Pure on its input, so results are memoized.
+    """
+    variables, includes, excludes, overrides = [], [], [], []
+    tokens = _shlex_split()(extra_args_str)
+    i = 0
+    while i < len(tokens):
+        spec = _ARG_TABLE.get(tokens[i])
+        if spec is None:
+            i += 1
+            continue
+        kind, step = spec
+        val = tokens[i + 1] if i + 1 < len(tokens) else None
+        if step == 2 and not val:
+            i += 1
+            continue
+
+        # Handling common arguments manually to integrate with API options
+        if kind == "variable":
+            variables.append(val)
+        elif kind == "include":
+            includes.append(val)
+        elif kind == "exclude":
+            excludes.append(val)
+        elif kind == "dryrun":
+            overrides.append(("dryrun", True))
+        else:
+            # loglevel, outputdir and randomize override the GUI selection
+            overrides.append((kind, val))
+        i += step
+    return tuple(variables), tuple(includes), tuple(excludes), tuple(overrides)
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalized_abs_path(path):
+    return os.path.normpath(path)
+
+
+def _abs_path(path):
+    """
+    os.path.abspath that skips the getcwd() call for paths that are already absolute.
+    Only absolute paths are memoized, since relative ones depend on the current directory.
+    """
+    path = os.fspath(path)
+    if os.path.isabs(path):
+        return _normalized_abs_path(path)
+    return os.path.abspath(path)
+
+
+_RUNNER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "robot_runner.py")
+_RUNNER_PIPE_BUFSIZE = 65536  # Events are unpickled from 64 KiB pipe reads
+
+
+def _run_in_subprocess(file_path, robot_options, callback, run_index=None):
+    """
+    Executes one run in a separate interpreter (robot_runner.py), keeping Robot
+    Framework off the caller's GIL. Listener events are streamed back through
+    the child's stdout and forwarded to `callback`.
+    """
+    request = {"file_path": file_path, "robot_options": robot_options, "run_index": run_index}
+    proc = subprocess.Popen([sys.executable, _RUNNER_SCRIPT],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=_RUNNER_PIPE_BUFSIZE,
+                            # A pythonw parent has no stderr for the runner to inherit
+                            stderr=subprocess.DEVNULL if sys.stderr is None else None,
+                            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    with proc:
+        pickle.dump(request, proc.stdin, protocol=pickle.HIGHEST_PROTOCOL)
+        proc.stdin.close()
+        while True:
+            try:
+                event = pickle.load(proc.stdout)
+            except EOFError:
+                break
+            callback(*event)
+    if proc.returncode:
+        callback("error", f"Critical Error: test runner exited with code {proc.returncode}", None)
+
+
+def _post_event(events, msg_type, message, payload):
+    events.put((msg_type, message, payload))
+
+
+def _one_run(file_path, run_index, runs, robot_options, events):
+    """
+    Executes a single run inside a worker process.
+    Listener events are posted to the `events` queue instead of a direct callback.
+    """
+    callback = functools.partial(_post_event, events)
+    callback("info", f"--- Run {run_index}/{runs} ---", None)
+    try:
+        _robot_run()(file_path, listener=RealTimeListener(callback, run_index), **robot_options)
+    except Exception as e:
+        callback("error", f"Critical Error: {e}", None)
+
+
+def _run_parallel(file_path, runs, robot_options, output_dir_abs, callback):
+    """
+    Executes `runs` runs in separate processes, each writing to <outputdir>/run_<n>.
+    Events from all workers are forwarded to `callback` on the calling thread.
+    Returns the output directory of the last run.
+    """
+    # "spawn" avoids forking a process that hosts GUI threads
+    ctx = multiprocessing.get_context("spawn")
+    workers = min(runs, os.cpu_count() or 1)
+    with ctx.Manager() as manager, ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        events = manager.Queue()
+        futures = [
+            pool.submit(_one_run, file_path, i, runs,
+                        dict(robot_options, outputdir=os.path.join(output_dir_abs, f"run_{i}")), events)
+            for i in range(1, runs + 1)
+        ]
+        while True:
+            try:
+                callback(*events.get(timeout=0.1))
+            except queue.Empty:
+                if all(f.done() for f in futures):
+                    break
+        # Events posted between the last timeout and the done check are still queued
+        while True:
+            try:
+                callback(*events.get_nowait())
+            except queue.Empty:
+                break
+        for f in futures:
+            if f.exception() is not None:
+                callback("error", f"Critical Error: {f.exception()}", None)
+    return os.path.join(output_dir_abs, f"run_{runs}")
+
+
 def run_tests_api(file_path, test_cases, tags, runs, options, callback):
     """
     Executes Robot Framework tests using the robot.run API.
     Handles run options, arguments, and variable injection.
+    Multiple runs each write to their own run_<n> output subdirectory and
+    execute in parallel worker processes, unless the "sequential" option or
+    exitonfailure is set.
+    Returns the output directory of the last run.
     """
 
     # Base options for robot.run
@@ -110,10 +493,17 @@ def run_tests_api(file_path, test_cases, tags, runs, options, callback):
         "stdout": None,
         "stderr": None,
         "dryrun": options.get("dryrun", False),
-        "loglevel": options.get("loglevel"),
         "exitonfailure": options.get("exitonfailure", False),
     }
 
+    # === FIX FOR ATTRIBUTE ERROR (Milestone 0.2.3) ===
+    # Only pass loglevel when it is set and not blank (the GUI default is None),
+    # so robot.run() otherwise uses its own default logic (INFO).
+    loglevel_val = (options.get("loglevel") or "").strip()
+    if loglevel_val:
+        robot_options["loglevel"] = loglevel_val
+    # =================================================
+
     if test_cases:
         robot_options["test"] = test_cases
 
@@ -125,40 +515,15 @@ def run_tests_api(file_path, test_cases, tags, runs, options, callback):
     extra_args_str = options.get("additional_args", "").strip()
     if extra_args_str:
         try:
-            tokens = shlex.split(extra_args_str)
-            i = 0
-            while i < len(tokens):
-                key = tokens[i]
-                val = tokens[i + 1] if i + 1 < len(tokens) else None
-
-                # Handling common arguments manually to integrate with API options
-                if key in ['-v', '--variable'] and val:
-                    variables.append(val)
-                    i += 2
-                elif key in ['-i', '--include'] and val:
-                    includes.append(val)
-                    i += 2
-                elif key in ['-e', '--exclude'] and val:
-                    if "exclude" not in robot_options:
-                        robot_options["exclude"] = []
-                    robot_options["exclude"].append(val)
-                    i += 2
-                elif key in ['-L', '--loglevel'] and val:
-                    robot_options["loglevel"] = val  # CLI argument overrides GUI selection
-                    i += 2
-                elif key in ['-d', '--outputdir'] and val:
-                    robot_options["outputdir"] = val
-                    i += 2
-                elif key == '--dryrun':
-                    robot_options["dryrun"] = True
-                    i += 1
-                elif key == '--randomize' and val:
-                    robot_options["randomize"] = val
-                    i += 2
-                else:
-                    i += 1
+            extra_variables, extra_includes, excludes, overrides = _parse_extra_args(extra_args_str)
         except Exception as e:
             callback("log", f"[WARN] Failed to parse additional args: {e}", None)
+        else:
+            variables.extend(extra_variables)
+            includes.extend(extra_includes)
+            if excludes:
+                robot_options["exclude"] = list(excludes)
+            robot_options.update(overrides)
 
     if variables:
         robot_options["variable"] = variables
@@ -166,22 +531,30 @@ def run_tests_api(file_path, test_cases, tags, runs, options, callback):
     if includes:
         robot_options["include"] = includes
 
-    listener = RealTimeListener(callback)
-    output_dir_abs = os.path.abspath(robot_options["outputdir"])
+    output_dir_abs = _abs_path(robot_options["outputdir"])
 
-    # === FIX FOR ATTRIBUTE ERROR (Milestone 0.2.3) ===
-    # If the value of loglevel is None (from GUI default) or an empty string,
-    # remove the key entirely so robot.run() uses its own default logic (INFO).
-    loglevel_val = robot_options.get("loglevel")
-    if loglevel_val is None or (isinstance(loglevel_val, str) and loglevel_val.strip() == ""):
-        if "loglevel" in robot_options:
-            del robot_options["loglevel"]
-    # =================================================
+    if runs > 1 and not options.get("sequential", False) and not robot_options["exitonfailure"]:
+        return _run_parallel(file_path, runs, robot_options, output_dir_abs, callback)
 
+    # Frozen builds have no separate interpreter to run robot_runner.py with
+    in_process = getattr(sys, "frozen", False)
+    listener = RealTimeListener(callback)
+    run_options = dict(robot_options)
+    base_dir = output_dir_abs
+    run_index = None
     for i in range(runs):
         callback("info", f"--- Run {i + 1}/{runs} ---", None)
+        if runs > 1:
+            # Like parallel runs, each run keeps its own run_<n> results instead of overwriting the last
+            run_index = i + 1
+            output_dir_abs = os.path.join(base_dir, f"run_{run_index}")
+            run_options["outputdir"] = output_dir_abs
         try:
-            robot_run(file_path, listener=listener, **robot_options)
+            if in_process:
+                listener.run_index = run_index
+                _robot_run()(file_path, listener=listener, **run_options)
+            else:
+                _run_in_subprocess(file_path, run_options, callback, run_index)
         except Exception as e:
             callback("error", f"Critical Error: {e}", None)
 
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Runs a single Robot Framework execution in its own interpreter.
+
+Used by robot_core.run_tests_api: a pickled request
+{"file_path", "robot_options", "run_index"} is read from stdin, and listener
+events are written to stdout as pickled (msg_type, message, payload) tuples.
+"""
+import os
+import sys
+import pickle
+from robot import run as robot_run
+from robot_core import RealTimeListener
+
+
+def main():
+    request = pickle.load(sys.stdin.buffer)
+
+    # Under pythonw the runner inherits no stderr; give it one that discards output
+    if sys.stderr is None:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        if devnull != 2:
+            os.dup2(devnull, 2)
+            os.close(devnull)
+        sys.stderr = sys.__stderr__ = open(2, "w", closefd=False)
+
+    # Keep the original stdout for events and point fd 1 at stderr,
+    # so Robot's console output cannot corrupt the event stream
+    events = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def send(msg_type, message, payload):
+        pickle.dump((msg_type, message, payload), events, protocol=pickle.HIGHEST_PROTOCOL)
+        events.flush()
+
+    try:
+        robot_run(request["file_path"],
+                  listener=RealTimeListener(send, request.get("run_index")),
+                  **request["robot_options"])
+    except Exception as e:
+        send("error", f"Critical Error: {e}", None)
+    finally:
+        events.close()
+
+
+if __name__ == "__main__":
+    main()